@@ -15,7 +15,7 @@ export interface INotification extends Document {
 }
 
 const NotificationSchema = new mongoose.Schema<INotification>({
-  userId: { type: String, required: true, index: true },
+  userId: { type: String, required: true },
   title: { type: String, required: true },
   message: { type: String, required: true },
   type: { type: String, required: true },
@@ -30,6 +30,9 @@ const NotificationSchema = new mongoose.Schema<INotification>({
   createdAt: { type: Date, default: Date.now }
 });
 
+// Matches listNotifications: filter by user + deleted, newest first, without an in-memory sort
+NotificationSchema.index({ userId: 1, deleted: 1, createdAt: -1 });
+
 export const NotificationModel = mongoose.model<INotification>(
   "Notification",
   NotificationSchema
@@ -20,12 +20,15 @@ export type Product = {
 /**
  * Fetches products from database with optimized query
  * Note: This is NOT cached to ensure instant updates
+ * Pass includeDescription=false for pickers that never show the
+ * (potentially multi-KB) description text.
  */
-async function getProducts(orgId: string): Promise<Product[]> {
+async function getProducts(orgId: string, includeDescription = true): Promise<Product[]> {
   const bigOrgId = BigInt(orgId);
   
   // Optimized single query with parallel aggregations
   const products = await prisma.product.findMany({
+    relationLoadStrategy: 'query',
     where: { 
       org_id: bigOrgId, 
       status: { not: 'deleted' } 
@@ -34,7 +37,7 @@ async function getProducts(orgId: string): Promise<Product[]> {
       product_id: true,
       name: true,
       sku: true,
-      description: true,
+      description: includeDescription,
       image_url: true,
       created_at: true,
       updated_at: true,
@@ -55,7 +58,7 @@ async function getProducts(orgId: string): Promise<Product[]> {
     id: p.product_id.toString(),
     name: p.name || '',
     sku: p.sku || '',
-    description: p.description || '',
+    ...(includeDescription && { description: p.description || '' }),
     stock: p.productStocks.reduce((acc, s) => acc + (s.quantity || 0), 0),
     price: p.productPrices[0]?.retail_price?.toNumber() || 0,
     image: p.image_url,
@@ -114,8 +117,11 @@ export async function GET(request: NextRequest) {
       );
     }
 
+    // view=summary skips the description column (order item picker)
+    const includeDescription = searchParams.get('view') !== 'summary';
+
     // Fetch products (NOT cached - always fresh data)
-    const products = await getProducts(orgId);
+    const products = await getProducts(orgId, includeDescription);
 
     // Return with aggressive no-cache headers for instant updates
     return NextResponse.json(products, {
@@ -29,7 +29,9 @@ export async function GET(
     // Ensure user is organization member
     await ensureOrganizationMember(orgId);
 
+    // Load the order, its items and users in a single joined query
     const order = await prisma.order.findFirst({
+      relationLoadStrategy: 'join',
       where: {
         order_id: BigInt(orderId),
         org_id: BigInt(orgId),
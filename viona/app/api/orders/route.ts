@@ -2,6 +2,7 @@
 import { NextResponse } from 'next/server';
 import prisma from '@/lib/prisma';
 import { getUserRole, hasPermission } from '@/lib/auth';
+import { CacheService } from '@/lib/cache';
 
 export type Order = {
   id: string;
@@ -67,12 +68,27 @@ export async function GET(request: Request) {
       }, { status: 403 });
     }
 
-    console.log('Orders API: Fetching from database (cache disabled)');
+    // Read the generation before the DB so a concurrent order write makes this fill unreachable
+    const cacheGen = await CacheService.getOrdersGeneration(orgId);
+    const cachedOrders = cacheGen === null ? null : await CacheService.getOrders(orgId, cacheGen);
+    if (cachedOrders) {
+      console.log(`Orders API: Serving ${cachedOrders.length} orders from cache`);
+      return NextResponse.json(cachedOrders, {
+        headers: {
+          'X-Cache': 'HIT',
+          'X-DB-Count': cachedOrders.length.toString(),
+        },
+      });
+    }
+
+    console.log('Orders API: Cache miss, fetching from database');
 
     const bigOrgId = BigInt(orgId);
     console.log(`Orders API: Fetching orders for org: ${bigOrgId}`);
     
+    // Load orders with their items, products and placers in a single joined query
     const orders = await prisma.order.findMany({
+      relationLoadStrategy: 'join',
       where: { org_id: bigOrgId },
       include: {
         orderItems: {
@@ -136,9 +152,13 @@ export async function GET(request: Request) {
       };
     });
 
+    if (cacheGen !== null) {
+      await CacheService.setOrders(orgId, cacheGen, mappedOrders);
+    }
+
     return NextResponse.json(mappedOrders, {
       headers: {
-        'X-Cache': 'DISABLED',
+        'X-Cache': 'MISS',
         'X-DB-Count': mappedOrders.length.toString(),
       },
     });
@@ -47,6 +47,7 @@ export async function GET(
     const bigOrgId = BigInt(orgId);
 
     const warehouse = await prisma.warehouse.findFirst({
+      relationLoadStrategy: 'query',
       where: {
         warehouse_id: warehouseId,
         org_id: bigOrgId,
@@ -32,26 +32,33 @@ const getCachedWarehouses = unstable_cache(
   async (orgId: string): Promise<Warehouse[]> => {
     const bigOrgId = BigInt(orgId);
 
-    const warehouses = await prisma.warehouse.findMany({
-      where: { org_id: bigOrgId },
-      include: {
-        productStocks: {
-          select: {
-            quantity: true,
-          },
+    // Aggregate stock per warehouse in the database instead of loading every stock row
+    const [warehouses, stockTotals] = await Promise.all([
+      prisma.warehouse.findMany({
+        where: { org_id: bigOrgId },
+        select: {
+          warehouse_id: true,
+          name: true,
+          address: true,
+          created_at: true,
+          updated_at: true,
         },
-        _count: {
-          select: { productStocks: true },
-        },
-      },
-      orderBy: { created_at: "asc" },
-    });
+        orderBy: { created_at: "asc" },
+      }),
+      prisma.productStock.groupBy({
+        by: ["warehouse_id"],
+        where: { warehouse: { org_id: bigOrgId } },
+        _sum: { quantity: true },
+        _count: { _all: true },
+      }),
+    ]);
+
+    const totalsByWarehouse = new Map(
+      stockTotals.map((row) => [row.warehouse_id, row])
+    );
 
     return warehouses.map((warehouse, index) => {
-      const totalStock = warehouse.productStocks.reduce(
-        (sum, stock) => sum + (stock.quantity ?? 0),
-        0
-      );
+      const totals = totalsByWarehouse.get(warehouse.warehouse_id);
 
       return {
         id: warehouse.warehouse_id.toString(),
@@ -59,8 +66,8 @@ const getCachedWarehouses = unstable_cache(
         address: warehouse.address ?? "No address",
         createdAt: warehouse.created_at?.toISOString() ?? new Date().toISOString(),
         updatedAt: warehouse.updated_at?.toISOString() ?? new Date().toISOString(),
-        productCount: warehouse._count.productStocks,
-        totalStock,
+        productCount: totals?._count._all ?? 0,
+        totalStock: totals?._sum.quantity ?? 0,
         isDefault: index === 0,
       };
     });
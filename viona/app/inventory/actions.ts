@@ -2,11 +2,13 @@
 "use server";
 
 import prisma from "@/lib/prisma";
+import type { Prisma } from "@prisma/client";
 import { auth, currentUser } from "@clerk/nextjs/server";
-import { getUserRole, hasPermission, ensureOrganizationMember } from "@/lib/auth";
+import { hasPermission, ensureOrganizationMember } from "@/lib/auth";
 import { revalidatePath, revalidateTag, unstable_cache } from "next/cache";
 import { CacheService } from "@/lib/cache";
-import { sendNotification } from "@/lib/kafka-producer";
+import { sendNotification, sendNotifications } from "@/lib/kafka-producer";
+import { LOW_STOCK_THRESHOLD } from "@/lib/constants/inventory";
 import type { Product } from "../api/inventory/products/route";
 
 // -----------------------------------------
@@ -29,8 +31,7 @@ function requireAuth() {
 
 async function requireRole(orgId: string, perms: string[]) {
   const userId = requireAuth();
-  await ensureOrganizationMember(orgId);
-  const role = await getUserRole(orgId);
+  const role = await ensureOrganizationMember(orgId);
 
   if (!hasPermission(role, perms)) {
     throw new Error("Insufficient permissions");
@@ -41,9 +42,7 @@ async function requireRole(orgId: string, perms: string[]) {
 
 // Notify a list of users (removes duplicate code)
 async function notifyMany(userIds: string[], payload: any) {
-  await Promise.all(
-    userIds.map((id) => sendNotification({ ...payload, userId: id }))
-  );
+  await sendNotifications(userIds.map((id) => ({ ...payload, userId: id })));
 }
 
 // -----------------------------------------
@@ -68,57 +67,60 @@ const getCachedProductDetails = unstable_cache(
     const bigOrgId = toBigInt(orgId);
     const bigPid = toBigInt(productId);
 
-    const product = await prisma.product.findFirst({
-      where: { product_id: bigPid, org_id: bigOrgId },
-      select: {
-        product_id: true,
-        name: true,
-        sku: true,
-        description: true,
-        image_url: true,
-        status: true,
-        created_at: true,
-        updated_at: true,
-        createdBy: { select: { user_id: true, email: true } },
-        modifiedBy: { select: { user_id: true, email: true } },
-        productStocks: {
-          where: { quantity: { gt: 0 } },
-          select: {
-            quantity: true,
-            warehouse: { select: { warehouse_id: true, name: true, address: true } },
+    // The recent-orders query is scoped to the org, so it can run alongside the product lookup
+    const [product, recentOrders] = await Promise.all([
+      prisma.product.findFirst({
+        relationLoadStrategy: "query",
+        where: { product_id: bigPid, org_id: bigOrgId },
+        select: {
+          product_id: true,
+          name: true,
+          sku: true,
+          description: true,
+          image_url: true,
+          status: true,
+          created_at: true,
+          updated_at: true,
+          createdBy: { select: { user_id: true, email: true } },
+          modifiedBy: { select: { user_id: true, email: true } },
+          productStocks: {
+            where: { quantity: { gt: 0 } },
+            select: {
+              quantity: true,
+              warehouse: { select: { warehouse_id: true, name: true, address: true } },
+            },
+          },
+          productPrices: {
+            orderBy: { valid_from: "desc" },
+            take: 10,
+            select: {
+              price_id: true,
+              retail_price: true,
+              actual_price: true,
+              market_price: true,
+              valid_from: true,
+              valid_to: true,
+            },
           },
         },
-        productPrices: {
-          orderBy: { valid_from: "desc" },
-          take: 10,
-          select: {
-            price_id: true,
-            retail_price: true,
-            actual_price: true,
-            market_price: true,
-            valid_from: true,
-            valid_to: true,
+      }),
+      prisma.orderItem.findMany({
+        relationLoadStrategy: "query",
+        where: { product_id: bigPid, order: { org_id: bigOrgId } },
+        select: {
+          quantity: true,
+          price_at_order: true,
+          order: {
+            select: { order_id: true, order_date: true, customer_name: true, status: true },
           },
         },
-      },
-    });
+        orderBy: { order: { order_date: "desc" } },
+        take: 5,
+      }),
+    ]);
 
     if (!product) throw new Error("Product not found");
 
-    // Faster separate query for orders
-    const recentOrders = await prisma.orderItem.findMany({
-      where: { product_id: bigPid, order: { org_id: bigOrgId } },
-      select: {
-        quantity: true,
-        price_at_order: true,
-        order: {
-          select: { order_id: true, order_date: true, customer_name: true, status: true },
-        },
-      },
-      orderBy: { order: { order_date: "desc" } },
-      take: 5,
-    });
-
     const totalStock = product.productStocks.reduce((a, s) => a + (s.quantity || 0), 0);
     const currentPrice = Number(product.productPrices[0]?.retail_price || 0);
 
@@ -171,7 +173,7 @@ const getCachedProductDetails = unstable_cache(
       currentMarketPrice: product.productPrices[0]?.market_price
         ? Number(product.productPrices[0].market_price)
         : undefined,
-      lowStockThreshold: 10,
+      lowStockThreshold: LOW_STOCK_THRESHOLD,
     };
   },
   ["product-details"],
@@ -196,7 +198,8 @@ const getCachedWarehouseList = unstable_cache(
     }));
   },
   ["warehouse-list"],
-  { tags: [TAGS.WAREHOUSE], revalidate: REVAL.LONG }
+  // "warehouse-list" is the tag the warehouse actions revalidate on writes
+  { tags: ["warehouse-list", TAGS.WAREHOUSE], revalidate: REVAL.SHORT }
 );
 
 // -----------------------------------------
@@ -223,33 +226,47 @@ async function getOrCreateUser(userId: string) {
   return user;
 }
 
-async function getOrCreateDefaultWarehouse(orgId: bigint) {
-  let warehouse = await prisma.warehouse.findFirst({
-    where: { org_id: Number(orgId) },
+// Pass `tx` when called inside a transaction so the lookup reuses its connection.
+// Transactional callers must revalidate "warehouse-list" after commit when `created` is set.
+async function getOrCreateDefaultWarehouse(
+  orgId: bigint,
+  db: Prisma.TransactionClient = prisma
+) {
+  const warehouse = await db.warehouse.findFirst({
+    where: { org_id: orgId },
     select: { warehouse_id: true, name: true },
   });
 
-  if (!warehouse) {
-    warehouse = await prisma.warehouse.create({
-      data: {
-        org_id: Number(orgId),
-        name: "Default Warehouse",
-        address: "Default Address",
-      },
-      select: { warehouse_id: true, name: true },
-    });
-  }
+  if (warehouse) return { ...warehouse, created: false };
 
-  return warehouse;
+  const newWarehouse = await db.warehouse.create({
+    data: {
+      org_id: orgId,
+      name: "Default Warehouse",
+      address: "Default Address",
+    },
+    select: { warehouse_id: true, name: true },
+  });
+
+  // Outside a transaction the row is already committed
+  if (db === prisma) revalidateTag("warehouse-list");
+
+  return { ...newWarehouse, created: true };
 }
 
 // -----------------------------------------
 // ✔️ OPTIMIZED AREA: CLEANER CACHE INVALIDATION
 // -----------------------------------------
 
-async function invalidateInventory(orgId: string, productId?: string) {
+// Cached order lists embed product name/SKU, so pass `orders` when either changes.
+async function invalidateInventory(
+  orgId: string,
+  productId?: string,
+  { orders = false }: { orders?: boolean } = {}
+) {
   await Promise.all([
     CacheService.invalidateProducts(orgId),
+    orders ? CacheService.invalidateOrders(orgId) : null,
     revalidateTag(`org-products-${orgId}`),
     productId ? revalidateTag(`product-${productId}`) : null,
     revalidatePath("/inventory"),
@@ -330,6 +347,7 @@ export async function addProduct(
 
     // Managers/admins notification
     const orgManagers = await prisma.organizationMember.findMany({
+      relationLoadStrategy: "query",
       where: {
         org_id: bigOrgId,
         role: { in: ["admin", "manager"] },
@@ -460,6 +478,7 @@ export async function updateProduct(
 
     if (product.oldName !== product.name) {
       const orgManagers = await prisma.organizationMember.findMany({
+        relationLoadStrategy: "query",
         where: {
           org_id: bigOrgId,
           role: { in: ["admin", "manager"] },
@@ -480,7 +499,7 @@ export async function updateProduct(
       );
     }
 
-    await invalidateInventory(orgId, productId);
+    await invalidateInventory(orgId, productId, { orders: true });
 
     console.log(`✅ Product updated: ${productId} (${product.name})`);
 
@@ -553,6 +572,7 @@ export async function deleteProduct(orgId: string, productId: string) {
     });
 
     const orgAdmins = await prisma.organizationMember.findMany({
+      relationLoadStrategy: "query",
       where: {
         org_id: bigOrgId,
         role: "admin",
@@ -608,6 +628,8 @@ export async function bulkUpdateProducts(
       select: { name: true },
     });
 
+    let defaultWarehouseCreated = false;
+
     const results = await prisma.$transaction(
       async (tx) => {
         const updateResults: { productId: string; name: string; sku: string }[] = [];
@@ -631,7 +653,8 @@ export async function bulkUpdateProducts(
           });
 
           if (update.data.stock !== undefined) {
-            const warehouse = await getOrCreateDefaultWarehouse(bigOrgId);
+            const warehouse = await getOrCreateDefaultWarehouse(bigOrgId, tx);
+            if (warehouse.created) defaultWarehouseCreated = true;
 
             const existingStock = await tx.productStock.findFirst({
               where: {
@@ -695,6 +718,8 @@ export async function bulkUpdateProducts(
       }
     );
 
+    if (defaultWarehouseCreated) revalidateTag("warehouse-list");
+
     console.log(`bulkUpdateProducts: Successfully updated ${results.length} products`);
 
     await sendNotification({
@@ -706,7 +731,9 @@ export async function bulkUpdateProducts(
       link: `/inventory/${orgId}`,
     });
 
-    await invalidateInventory(orgId);
+    await invalidateInventory(orgId, undefined, {
+      orders: updates.some((u) => u.data.name !== undefined || u.data.sku !== undefined),
+    });
 
     return {
       success: true,
@@ -730,21 +757,30 @@ export async function bulkUpdateProducts(
 
 export async function warmupProductCache(orgId: string) {
   try {
-    await ensureOrganizationMember(orgId);
-    const role = await getUserRole(orgId);
+    const role = await ensureOrganizationMember(orgId);
     if (!hasPermission(role, ["reader", "writer", "read-write", "admin"])) {
       throw new Error("Insufficient permissions to access products");
     }
 
     const bigOrgId = toBigInt(orgId);
 
+    // Only load the columns the cached Product shape needs
     const products = await prisma.product.findMany({
+      relationLoadStrategy: "query",
       where: { org_id: bigOrgId },
-      include: {
-        productStocks: true,
+      select: {
+        product_id: true,
+        name: true,
+        sku: true,
+        description: true,
+        image_url: true,
+        created_at: true,
+        updated_at: true,
+        productStocks: { select: { quantity: true } },
         productPrices: {
           orderBy: { valid_from: "desc" },
           take: 1,
+          select: { retail_price: true },
         },
       },
     });
@@ -854,7 +890,9 @@ export async function updateProductDetails(
       }
     });
 
-    await invalidateInventory(orgId, productId);
+    await invalidateInventory(orgId, productId, {
+      orders: data.name !== undefined || data.sku !== undefined,
+    });
 
     return { success: true };
   } catch (error) {
@@ -882,6 +920,7 @@ export async function deleteProductDetails(orgId: string, productId: string) {
 
     const [product, orderItems] = await Promise.all([
       prisma.product.findFirst({
+        relationLoadStrategy: "query",
         where: { product_id: bigPid, org_id: bigOrgId },
         select: {
           product_id: true,
@@ -896,6 +935,7 @@ export async function deleteProductDetails(orgId: string, productId: string) {
         },
       }),
       prisma.orderItem.findMany({
+        relationLoadStrategy: "query",
         where: { product_id: bigPid },
         select: {
           order_item_id: true,
@@ -990,9 +1030,7 @@ export async function updateProductStock(
     const bigProductId = toBigInt(productId);
     const bigWarehouseId = toBigInt(warehouseId);
 
-    await ensureOrganizationMember(orgId);
-
-    const role = await getUserRole(orgId);
+    const role = await ensureOrganizationMember(orgId);
     if (!hasPermission(role, ["writer", "read-write", "admin"])) {
       throw new Error("Insufficient permissions to update stock");
     }
@@ -1000,12 +1038,12 @@ export async function updateProductStock(
     const user = await getOrCreateUser(userId);
 
     const [product, warehouse, org] = await Promise.all([
-      prisma.product.findUnique({
-        where: { product_id: bigProductId },
+      prisma.product.findFirst({
+        where: { product_id: bigProductId, org_id: bigOrgId },
         select: { name: true, sku: true },
       }),
-      prisma.warehouse.findUnique({
-        where: { warehouse_id: bigWarehouseId },
+      prisma.warehouse.findFirst({
+        where: { warehouse_id: bigWarehouseId, org_id: bigOrgId },
         select: { name: true },
       }),
       prisma.organization.findUnique({
@@ -1014,6 +1052,9 @@ export async function updateProductStock(
       }),
     ]);
 
+    if (!product) throw new Error("Product not found in this organization");
+    if (!warehouse) throw new Error("Warehouse not found in this organization");
+
     let newQuantity = 0;
 
     await prisma.$transaction(async (tx) => {
@@ -1050,16 +1091,17 @@ export async function updateProductStock(
     await sendNotification({
       userId: user.clerk_id,
       title: "Stock Updated",
-      message: `Stock for "${product?.name}" at ${warehouse?.name}: ${
+      message: `Stock for "${product.name}" at ${warehouse.name}: ${
         adjustment > 0 ? "+" : ""
       }${adjustment} (New: ${newQuantity})`,
       type: "system",
-      priority: newQuantity < 10 ? "HIGH" : "MEDIUM",
+      priority: newQuantity < LOW_STOCK_THRESHOLD ? "HIGH" : "MEDIUM",
       link: `/inventory/${orgId}`,
     });
 
-    if (newQuantity < 10) {
+    if (newQuantity < LOW_STOCK_THRESHOLD) {
       const orgManagers = await prisma.organizationMember.findMany({
+        relationLoadStrategy: "query",
         where: {
           org_id: bigOrgId,
           role: { in: ["admin", "manager"] },
@@ -1072,7 +1114,7 @@ export async function updateProductStock(
         orgManagers.map((m) => m.user.clerk_id),
         {
           title: "Low Stock Alert",
-          message: `"${product?.name}" stock at ${warehouse?.name} is low: ${newQuantity} units`,
+          message: `"${product.name}" stock at ${warehouse.name} is low: ${newQuantity} units`,
           type: "system",
           priority: "HIGH",
           link: `/inventory/${orgId}`,
@@ -1117,7 +1159,11 @@ export async function transferStock(
 
     await prisma.$transaction(async (tx) => {
       const fromStock = await tx.productStock.findFirst({
-        where: { product_id: bigPid, warehouse_id: bigFromWarehouse },
+        where: {
+          product_id: bigPid,
+          warehouse_id: bigFromWarehouse,
+          warehouse: { org_id: bigOrgId },
+        },
       });
 
       if (!fromStock || fromStock.quantity < quantity) {
@@ -1129,6 +1175,15 @@ export async function transferStock(
         data: { quantity: fromStock.quantity - quantity },
       });
 
+      const toWarehouse = await tx.warehouse.findFirst({
+        where: { warehouse_id: bigToWarehouse, org_id: bigOrgId },
+        select: { warehouse_id: true },
+      });
+
+      if (!toWarehouse) {
+        throw new Error("Destination warehouse not found in this organization");
+      }
+
       const toStock = await tx.productStock.findFirst({
         where: { product_id: bigPid, warehouse_id: bigToWarehouse },
       });
@@ -1191,6 +1246,7 @@ const getCachedWarehousesWithStock = unstable_cache(
     const bigProductId = toBigInt(productId);
 
     const warehouses = await prisma.warehouse.findMany({
+      relationLoadStrategy: "query",
       where: { org_id: bigOrgId },
       include: {
         productStocks: {
@@ -1334,23 +1390,42 @@ export async function updateProductStatus(
     });
     if (!user) throw new Error("User not found");
 
-    const product = await prisma.product.update({
-      where: { product_id: bigPid, org_id: bigOrgId },
+    // Conditional write: a no-op status change matches no rows, so there is
+    // no separate read and no window between the check and the update
+    const { count } = await prisma.product.updateMany({
+      where: {
+        product_id: bigPid,
+        org_id: bigOrgId,
+        OR: [{ status: { not: status } }, { status: null }],
+      },
       data: {
         status,
         modified_by: user.user_id,
       },
-      select: { name: true, status: true },
     });
 
+    if (count === 0) {
+      const current = await prisma.product.findFirst({
+        where: { product_id: bigPid, org_id: bigOrgId },
+        select: { name: true },
+      });
+      if (!current) throw new Error("Product not found in this organization");
+
+      return {
+        success: true,
+        productId: productId.toString(),
+        status,
+        message: `Product "${current.name}" is already ${status}`,
+      };
+    }
+
     await invalidateInventory(orgId, productId);
 
     return {
       success: true,
       productId: productId.toString(),
-      productName: product.name,
-      status: product.status,
-      message: `Product "${product.name}" status updated to ${status}`,
+      status,
+      message: `Product status updated to ${status}`,
     };
   } catch (error) {
     console.error("Error updating product status:", error);
@@ -1366,25 +1441,7 @@ export async function getWarehousesForDialog(orgId: string) {
   try {
     await requireRole(orgId, ["reader", "writer", "read-write", "admin"]);
 
-    const bigOrgId = toBigInt(orgId);
-
-    const warehouses = await prisma.warehouse.findMany({
-      where: { org_id: bigOrgId },
-      select: {
-        warehouse_id: true,
-        name: true,
-        address: true,
-      },
-      orderBy: { name: "asc" },
-    });
-
-    console.log("Fetched warehouses in action:", warehouses.length);
-
-    return warehouses.map((w) => ({
-      id: w.warehouse_id.toString(),
-      name: w.name || "Unnamed Warehouse",
-      address: w.address || "",
-    }));
+    return await getCachedWarehouseList(orgId);
   } catch (error) {
     console.error("Error fetching warehouses for dialog:", error);
 
@@ -24,6 +24,7 @@ import { DeleteConfirmationDialog } from "./DeleteConfirmationDialog";
 import { Edit, Trash2, Eye, Loader2 } from "lucide-react";
 import type { Product } from "../../api/inventory/products/route";
 import { useOrgStore } from "@/hooks/useOrgStore";
+import { LOW_STOCK_THRESHOLD } from "@/lib/constants/inventory";
 
 interface ProductTableProps {
   products: Product[];
@@ -70,7 +71,7 @@ const ProductRow = memo(
     const stockStatus = useMemo(() => {
       if (product.stock === 0)
         return { label: "Out of Stock", variant: "secondary" as const };
-      if (product.stock < 10)
+      if (product.stock < LOW_STOCK_THRESHOLD)
         return { label: "Low Stock", variant: "destructive" as const };
       return { label: "In Stock", variant: "default" as const };
     }, [product.stock]);
@@ -110,7 +111,7 @@ const ProductRow = memo(
         <TableCell>
           <div className="flex items-center gap-2">
             <span className="min-w-[20px] font-medium">{product.stock}</span>
-            {product.stock < 10 && product.stock > 0 && (
+            {product.stock < LOW_STOCK_THRESHOLD && product.stock > 0 && (
               <Badge variant="destructive" className="text-xs">
                 Low
               </Badge>
@@ -20,6 +20,7 @@ import { addProduct, updateProduct, deleteProduct } from "./actions";
 import { useOrgStore } from "@/hooks/useOrgStore";
 import type { Product } from "../api/inventory/products/route";
 import { LoadingSpinner } from "@/components/LoadingSpinner";
+import { LOW_STOCK_THRESHOLD } from "@/lib/constants/inventory";
 
 
 import { getRole } from "@/app/orders/actions"; 
@@ -157,9 +158,9 @@ export default function InventoryPage() {
       filtered = filtered.filter((product) => {
         switch (filters.stockFilter) {
           case "inStock":
-            return product.stock >= 10;
+            return product.stock >= LOW_STOCK_THRESHOLD;
           case "lowStock":
-            return product.stock > 0 && product.stock < 10;
+            return product.stock > 0 && product.stock < LOW_STOCK_THRESHOLD;
           case "outOfStock":
             return product.stock === 0;
           default:
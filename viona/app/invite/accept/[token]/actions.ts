@@ -3,7 +3,7 @@
 import prisma from "@/lib/prisma";
 import { auth } from "@clerk/nextjs/server";
 import { revalidatePath } from "next/cache";
-import { sendNotification } from "@/lib/kafka-producer";
+import { sendNotification, sendNotifications } from "@/lib/kafka-producer";
 import {
   invalidateOrgMemberCache,
   invalidateUserCache,
@@ -40,6 +40,7 @@ export async function getInviteDetails(token: string) {
 
     // Fetch invite
     const invite = await prisma.organizationInvite.findUnique({
+      relationLoadStrategy: "query",
       where: { token: token.trim() },
       select: {
         invite_id: true,
@@ -174,6 +175,7 @@ export async function acceptInvite(token: string) {
     const result = await prisma.$transaction(async (tx) => {
       // Fetch and lock the invite
       const invite = await tx.organizationInvite.findUnique({
+        relationLoadStrategy: "query",
         where: { token: token.trim() },
         select: {
           invite_id: true,
@@ -271,6 +273,7 @@ export async function acceptInvite(token: string) {
 
       // Notify all admins about new member
       const admins = await prisma.organizationMember.findMany({
+        relationLoadStrategy: "query",
         where: {
           org_id: BigInt(result.orgId),
           role: "admin",
@@ -282,19 +285,19 @@ export async function acceptInvite(token: string) {
         },
       });
 
-      for (const admin of admins) {
-        // Don't notify if admin is the new member
-        if (admin.user.clerk_id !== userId) {
-          await sendNotification({
+      await sendNotifications(
+        admins
+          // Don't notify if admin is the new member
+          .filter((admin) => admin.user.clerk_id !== userId)
+          .map((admin) => ({
             userId: admin.user.clerk_id,
             title: "New Team Member",
             message: `${user.email} joined as a ${result.role}`,
             type: "system",
             priority: "MEDIUM",
             link: `/organization/${result.orgId}?tab=members`,
-          });
-        }
-      }
+          }))
+      );
     } catch (notifError) {
       // Log notification errors but don't fail the operation
       console.error("Failed to send notifications:", notifError);
@@ -343,6 +346,7 @@ export async function declineInvite(token: string) {
     }
 
     const invite = await prisma.organizationInvite.findUnique({
+      relationLoadStrategy: "query",
       where: { token: token.trim() },
       select: {
         invite_id: true,
@@ -377,6 +381,7 @@ export async function declineInvite(token: string) {
 
     // Notify admins about declined invitation
     const admins = await prisma.organizationMember.findMany({
+      relationLoadStrategy: "query",
       where: {
         org_id: invite.org.org_id,
         role: "admin",
@@ -388,16 +393,14 @@ export async function declineInvite(token: string) {
       },
     });
 
-    for (const admin of admins) {
-      await sendNotification({
-        userId: admin.user.clerk_id,
-        title: "Invitation Declined",
-        message: `${user.email} declined the invitation to join ${invite.org.name}`,
-        type: "system",
-        priority: "LOW",
-        link: `/organization/${invite.org.org_id}?tab=invites`,
-      });
-    }
+    await sendNotifications(admins.map((admin) => ({
+      userId: admin.user.clerk_id,
+      title: "Invitation Declined",
+      message: `${user.email} declined the invitation to join ${invite.org.name}`,
+      type: "system",
+      priority: "LOW",
+      link: `/organization/${invite.org.org_id}?tab=invites`,
+    })));
 
     revalidatePath(`/organization/${invite.org.org_id}`);
 
@@ -2,11 +2,16 @@
 'use server';
 
 import prisma from '@/lib/prisma';
+import type { Prisma } from '@prisma/client';
 import { auth } from '@clerk/nextjs/server';
 import { currentUser } from '@clerk/nextjs/server';
 import { getUserRole, hasPermission, ensureOrganizationMember } from '@/lib/auth'; 
-import { revalidatePath } from 'next/cache';
-import { sendNotification } from '@/lib/kafka-producer';
+import { revalidatePath, revalidateTag } from 'next/cache';
+import { sendNotification, sendNotifications } from '@/lib/kafka-producer';
+import { CacheService } from '@/lib/cache';
+
+// Status changes that admins are notified about
+const IMPORTANT_STATUSES = new Set(['completed', 'cancelled', 'shipped']);
 
 // Cache user lookup to avoid repeated queries
 async function getOrCreateUser(userId: string) {
@@ -33,24 +38,75 @@ async function getOrCreateUser(userId: string) {
   return user;
 }
 
-async function getOrCreateDefaultWarehouse(orgId: BigInt) {
-  let warehouse = await prisma.warehouse.findFirst({
-    where: { org_id: Number(orgId)},
+// Pass `tx` when called inside a transaction so the lookup reuses its connection.
+// Transactional callers must revalidate 'warehouse-list' after commit when `created` is set.
+async function getOrCreateDefaultWarehouse(orgId: bigint, db: Prisma.TransactionClient = prisma) {
+  const warehouse = await db.warehouse.findFirst({
+    where: { org_id: orgId },
     select: { warehouse_id: true, name: true }
   });
   
-  if (!warehouse) {
-    warehouse = await prisma.warehouse.create({
-      data: {
-        org_id: Number(orgId),
-        name: 'Default Warehouse',
-        address: 'Default Address',
-      },
-      select: { warehouse_id: true, name: true }
-    });
+  if (warehouse) return { ...warehouse, created: false };
+
+  const newWarehouse = await db.warehouse.create({
+    data: {
+      org_id: orgId,
+      name: 'Default Warehouse',
+      address: 'Default Address',
+    },
+    select: { warehouse_id: true, name: true }
+  });
+
+  // Outside a transaction the row is already committed
+  if (db === prisma) revalidateTag('warehouse-list');
+
+  return { ...newWarehouse, created: true };
+}
+
+// Latest retail price per product, fetched in one query for the whole order
+async function getLatestRetailPrices(db: Prisma.TransactionClient, productIds: bigint[]) {
+  const prices = new Map<bigint, number>();
+  if (productIds.length === 0) return prices;
+
+  // Orders may list the same product on several lines; bind each id once
+  const uniqueIds = Array.from(new Set(productIds));
+
+  // The join strategy turns `take: 1` into a LATERAL ... LIMIT 1 per product,
+  // served by the (product_id, valid_from DESC) index
+  const products = await db.product.findMany({
+    where: { product_id: { in: uniqueIds } },
+    relationLoadStrategy: 'join',
+    select: {
+      product_id: true,
+      productPrices: {
+        orderBy: { valid_from: 'desc' },
+        take: 1,
+        select: { retail_price: true }
+      }
+    }
+  });
+
+  for (const product of products) {
+    const latest = product.productPrices[0];
+    if (latest) prices.set(product.product_id, Number(latest.retail_price));
   }
-  
-  return warehouse;
+  return prices;
+}
+
+// Handle different possible data structures for product ID
+function resolveProductId(item: any): bigint {
+  if (item.product && item.product.id) {
+    // Case 1: item has product object with id
+    return BigInt(item.product.id);
+  } else if (item.productId) {
+    // Case 2: item has direct productId field
+    return BigInt(item.productId);
+  } else if (item.product_id) {
+    // Case 3: item has product_id field (database format)
+    return BigInt(item.product_id);
+  }
+  console.error('Invalid item structure:', item);
+  throw new Error(`Invalid product reference in order item. Expected item.product.id, item.productId, or item.product_id`);
 }
 
 export async function addOrder(orgId: string, newOrder: any) {
@@ -74,10 +130,7 @@ export async function addOrder(orgId: string, newOrder: any) {
     const bigOrgId = BigInt(orgId);
     
     // Ensure user is organization member and has proper role
-    await ensureOrganizationMember(orgId);
-    
-    // Get user role after ensuring membership
-    const role = await getUserRole(orgId);
+    const role = await ensureOrganizationMember(orgId);
     console.log(`addOrder: Retrieved role "${role}" (type: ${typeof role}) for orgId ${orgId}`);
     
     // Permission check with explicit role validation
@@ -85,14 +138,14 @@ export async function addOrder(orgId: string, newOrder: any) {
       throw new Error(`Insufficient permissions to add orders. Current role: "${role}"`);
     }
 
-    // Get or create user record
-    const user = await getOrCreateUser(userId);
-    
-    // Get organization name for notifications
-    const org = await prisma.organization.findUnique({
-      where: { org_id: bigOrgId },
-      select: { name: true }
-    });
+    // Get or create user record, and organization name for notifications
+    const [user, org] = await Promise.all([
+      getOrCreateUser(userId),
+      prisma.organization.findUnique({
+        where: { org_id: bigOrgId },
+        select: { name: true }
+      }),
+    ]);
     
     // Sanitize input data
     const orderDate = new Date(newOrder.orderDate);
@@ -105,110 +158,109 @@ export async function addOrder(orgId: string, newOrder: any) {
       if (item.quantity <= 0) throw new Error('Quantity must be positive');
     }
 
+    let defaultWarehouseCreated = false;
+
     // Execute transaction for atomic order creation
     const result = await prisma.$transaction(async (tx:any) => {
       console.log(`Transaction: Creating order with status "${trimmedStatus}" on ${orderDate}`);
-      
-      // Create the order with customer information
-      const order = await tx.order.create({
-        data: {
-          org_id: bigOrgId,
-          placed_by: user.user_id,
-          order_date: orderDate,
-          status: trimmedStatus,
-          total_amount: totalAmount,
-          // Customer Information
-          customer_name: newOrder.customer.name.trim(),
-          customer_email: newOrder.customer.email.trim(),
-          customer_phone: newOrder.customer.phone.trim(),
-          // Shipping Address
-          shipping_street: newOrder.customer.address.street?.trim() || '',
-          shipping_city: newOrder.customer.address.city?.trim() || '',
-          shipping_state: newOrder.customer.address.state?.trim() || '',
-          shipping_zip: newOrder.customer.address.zipCode?.trim() || '',
-          shipping_country: newOrder.customer.address.country?.trim() || 'USA',
-          // Additional Information
-          notes: newOrder.notes?.trim() || '',
-          shipping_method: newOrder.shippingMethod?.trim() || 'standard',
-          payment_method: newOrder.paymentMethod?.trim() || 'credit_card',
-        },
-        select: { 
-          order_id: true, 
-          order_date: true, 
-          status: true,
-          total_amount: true,
-          customer_name: true,
-          customer_email: true,
-          created_at: true 
-        }
-      });
 
-      console.log(`Transaction: Created order ${order.order_id} for customer ${order.customer_name}`);
-
-      const warehouse = await getOrCreateDefaultWarehouse(bigOrgId);
+      const warehouse = await getOrCreateDefaultWarehouse(bigOrgId, tx);
+      defaultWarehouseCreated = warehouse.created;
       console.log(`Transaction: Using warehouse ${warehouse.warehouse_id} for stock updates`);
 
       let calculatedTotal = 0;
+      const itemRows: { product_id: bigint; quantity: number; price_at_order: number }[] = [];
+
+      // Fetch current prices for items that didn't provide one
+      const latestPrices = await getLatestRetailPrices(
+        tx,
+        newOrder.orderItems
+          .filter((item: any) => !item.priceAtOrder)
+          .map((item: any) => BigInt(item.product.id))
+      );
 
       for (const item of newOrder.orderItems) {
         const productId = BigInt(item.product.id);
         
-        // Fetch current product price if not provided
         let priceAtOrder = item.priceAtOrder;
         if (!priceAtOrder) {
-          const latestPrice = await tx.productPrice.findFirst({
-            where: { product_id: productId },
-            orderBy: { valid_from: 'desc' },
-            select: { retail_price: true }
-          });
-          if (!latestPrice) throw new Error(`No price found for product ${productId}`);
-          priceAtOrder = Number(latestPrice.retail_price);
+          const latestPrice = latestPrices.get(productId);
+          if (latestPrice === undefined) throw new Error(`No price found for product ${productId}`);
+          priceAtOrder = latestPrice;
         }
 
         calculatedTotal += priceAtOrder * item.quantity;
 
-        // Create order item
-        const orderItem = await tx.orderItem.create({
-          data: {
-            order_id: order.order_id,
-            product_id: productId,
-            quantity: item.quantity,
-            price_at_order: priceAtOrder,
-          },
-          select: { order_item_id: true }
+        itemRows.push({
+          product_id: productId,
+          quantity: item.quantity,
+          price_at_order: priceAtOrder,
         });
 
-        console.log(`Transaction: Created order item ${orderItem.order_item_id}`);
-
         // Deduct stock (assuming sales order)
         const stockRecord = await tx.productStock.findFirst({
           where: {
             product_id: productId,
             warehouse_id: warehouse.warehouse_id
           },
-          select: { stock_id: true, quantity: true }
+          select: { stock_id: true }
         });
 
         if (!stockRecord) throw new Error(`No stock found for product ${productId}`);
-        if (stockRecord.quantity < item.quantity) throw new Error(`Insufficient stock for product ${productId}`);
 
-        await tx.productStock.update({
-          where: { stock_id: stockRecord.stock_id },
-          data: { quantity: stockRecord.quantity - item.quantity }
+        // Check and decrement in one statement so concurrent orders cannot oversell
+        const { count } = await tx.productStock.updateMany({
+          where: { stock_id: stockRecord.stock_id, quantity: { gte: item.quantity } },
+          data: { quantity: { decrement: item.quantity } }
         });
+        if (count === 0) throw new Error(`Insufficient stock for product ${productId}`);
 
         console.log(`Transaction: Deducted ${item.quantity} from stock for product ${productId}`);
       }
 
-      // Update total if calculated differs
       if (calculatedTotal !== totalAmount) {
-        await tx.order.update({
-          where: { order_id: order.order_id },
-          data: { total_amount: calculatedTotal }
-        });
-        console.log(`Transaction: Updated total to ${calculatedTotal}`);
+        console.log(`Transaction: Using calculated total ${calculatedTotal} instead of submitted ${totalAmount}`);
       }
 
+      // Create the order and its items in one write, with the final total
+      const order = await tx.order.create({
+        data: {
+          org_id: bigOrgId,
+          placed_by: user.user_id,
+          order_date: orderDate,
+          status: trimmedStatus,
+          total_amount: calculatedTotal,
+          // Customer Information
+          customer_name: newOrder.customer.name.trim(),
+          customer_email: newOrder.customer.email.trim(),
+          customer_phone: newOrder.customer.phone.trim(),
+          // Shipping Address
+          shipping_street: newOrder.customer.address.street?.trim() || '',
+          shipping_city: newOrder.customer.address.city?.trim() || '',
+          shipping_state: newOrder.customer.address.state?.trim() || '',
+          shipping_zip: newOrder.customer.address.zipCode?.trim() || '',
+          shipping_country: newOrder.customer.address.country?.trim() || 'USA',
+          // Additional Information
+          notes: newOrder.notes?.trim() || '',
+          shipping_method: newOrder.shippingMethod?.trim() || 'standard',
+          payment_method: newOrder.paymentMethod?.trim() || 'credit_card',
+          orderItems: {
+            createMany: { data: itemRows }
+          },
+        },
+        select: { 
+          order_id: true, 
+          order_date: true, 
+          status: true,
+          total_amount: true,
+          customer_name: true,
+          customer_email: true,
+          created_at: true 
+        }
+      });
+
+      console.log(`Transaction: Created order ${order.order_id} with ${itemRows.length} items for customer ${order.customer_name}`);
+
       return {
         orderId: order.order_id.toString(),
         orderDate: order.order_date.toISOString(),
@@ -225,6 +277,10 @@ export async function addOrder(orgId: string, newOrder: any) {
       timeout: 10000,
     });
 
+    // Bump the orders cache generation as soon as the write is committed
+    await CacheService.invalidateOrders(orgId);
+    if (defaultWarehouseCreated) revalidateTag('warehouse-list');
+
     console.log(`addOrder: Successfully created order for customer ${result.customerName}:`, result);
 
     // ✅ Send notification to order creator
@@ -239,6 +295,7 @@ export async function addOrder(orgId: string, newOrder: any) {
 
     // ✅ Notify organization admins about new order
     const orgAdmins = await prisma.organizationMember.findMany({
+      relationLoadStrategy: 'query',
       where: {
         org_id: bigOrgId,
         role: 'admin',
@@ -249,16 +306,14 @@ export async function addOrder(orgId: string, newOrder: any) {
       }
     });
 
-    for (const admin of orgAdmins) {
-      await sendNotification({
-        userId: admin.user.clerk_id,
-        title: 'New Order Created',
-        message: `Order #${result.orderId} for ${result.customerName} in "${org?.name}" ($${result.totalAmount})`,
-        type: 'order',
-        priority: 'LOW',
-        link: `/orders/${result.orderId}`,
-      });
-    }
+    await sendNotifications(orgAdmins.map((admin) => ({
+      userId: admin.user.clerk_id,
+      title: 'New Order Created',
+      message: `Order #${result.orderId} for ${result.customerName} in "${org?.name}" ($${result.totalAmount})`,
+      type: 'order',
+      priority: 'LOW',
+      link: `/orders/${result.orderId}`,
+    })));
 
     // Revalidate relevant pages
     revalidatePath('/orders');
@@ -310,11 +365,8 @@ export async function updateOrder(orgId: string, id: string, updatedOrder: any)
 
   // Add validation for order items structure - FIX FOR THE ERROR
   if (updatedOrder.orderItems) {
-    console.log('Validating order items structure:', JSON.stringify(updatedOrder.orderItems, null, 2));
-    
     for (let i = 0; i < updatedOrder.orderItems.length; i++) {
       const item = updatedOrder.orderItems[i];
-      console.log(`Item ${i}:`, JSON.stringify(item, null, 2));
       
       if (!item.quantity || item.quantity <= 0) {
         throw new Error(`Invalid quantity for item ${i + 1}`);
@@ -332,36 +384,36 @@ export async function updateOrder(orgId: string, id: string, updatedOrder: any)
   try {
     const bigOrgId = BigInt(orgId);
     
-    await ensureOrganizationMember(orgId);
-    
-    const role = await getUserRole(orgId);
+    const role = await ensureOrganizationMember(orgId);
     if (!hasPermission(role, ['writer', 'read-write', 'admin'])) {
       throw new Error('Insufficient permissions to update orders');
     }
 
     const orderId = BigInt(id);
-    const user = await getOrCreateUser(userId);
 
-    // Get organization name for notifications
-    const org = await prisma.organization.findUnique({
-      where: { org_id: bigOrgId },
-      select: { name: true }
-    });
-
-    // Check if order exists and belongs to the organization
-    const existingOrder = await prisma.order.findFirst({
-      where: {
-        order_id: orderId,
-        org_id: bigOrgId,
-      },
-      select: { 
-        order_id: true, 
-        orderItems: true,
-        customer_name: true,
-        status: true,
-        placed_by: true,
-      }
-    });
+    // User, organization name (for notifications) and the existing order are independent lookups
+    const [user, org, existingOrder] = await Promise.all([
+      getOrCreateUser(userId),
+      prisma.organization.findUnique({
+        where: { org_id: bigOrgId },
+        select: { name: true }
+      }),
+      // Check if order exists and belongs to the organization
+      prisma.order.findFirst({
+        relationLoadStrategy: 'query',
+        where: {
+          order_id: orderId,
+          org_id: bigOrgId,
+        },
+        select: { 
+          order_id: true, 
+          orderItems: true,
+          customer_name: true,
+          status: true,
+          placed_by: true,
+        }
+      }),
+    ]);
 
     if (!existingOrder) {
       throw new Error('Order not found in this organization');
@@ -369,6 +421,8 @@ export async function updateOrder(orgId: string, id: string, updatedOrder: any)
 
     const oldStatus = existingOrder.status;
 
+    let defaultWarehouseCreated = false;
+
     const result = await prisma.$transaction(async (tx:any) => {
       console.log(`Transaction: Updating order ${orderId}`);
       
@@ -416,7 +470,8 @@ export async function updateOrder(orgId: string, id: string, updatedOrder: any)
 
       console.log(`Transaction: Updated order details for customer ${updatedOrderRecord.customer_name}`);
 
-      const warehouse = await getOrCreateDefaultWarehouse(bigOrgId);
+      const warehouse = await getOrCreateDefaultWarehouse(bigOrgId, tx);
+      defaultWarehouseCreated = warehouse.created;
 
       // Handle order items updates if provided
       if (updatedOrder.orderItems) {
@@ -427,13 +482,13 @@ export async function updateOrder(orgId: string, id: string, updatedOrder: any)
               product_id: existingItem.product_id,
               warehouse_id: warehouse.warehouse_id
             },
-            select: { stock_id: true, quantity: true }
+            select: { stock_id: true }
           });
 
           if (stockRecord) {
             await tx.productStock.update({
               where: { stock_id: stockRecord.stock_id },
-              data: { quantity: stockRecord.quantity + (existingItem.quantity || 0) }
+              data: { quantity: { increment: existingItem.quantity || 0 } }
             });
           }
         }
@@ -444,47 +499,31 @@ export async function updateOrder(orgId: string, id: string, updatedOrder: any)
         });
 
         let calculatedTotal = 0;
+        const itemRows: { order_id: bigint; product_id: bigint; quantity: number; price_at_order: number }[] = [];
+
+        const latestPrices = await getLatestRetailPrices(
+          tx,
+          updatedOrder.orderItems
+            .filter((item: any) => !(item.priceAtOrder || item.price_at_order))
+            .map(resolveProductId)
+        );
 
         // Create new items and deduct stock - FIXED TO HANDLE MULTIPLE DATA FORMATS
         for (const item of updatedOrder.orderItems) {
-          console.log('Processing item:', JSON.stringify(item, null, 2));
-          
-          // Handle different possible data structures for product ID - THE FIX
-          let productId: BigInt;
-          
-          if (item.product && item.product.id) {
-            // Case 1: item has product object with id
-            productId = BigInt(item.product.id);
-          } else if (item.productId) {
-            // Case 2: item has direct productId field
-            productId = BigInt(item.productId);
-          } else if (item.product_id) {
-            // Case 3: item has product_id field (database format)
-            productId = BigInt(item.product_id);
-          } else {
-            console.error('Invalid item structure:', item);
-            throw new Error(`Invalid product reference in order item. Expected item.product.id, item.productId, or item.product_id`);
-          }
+          const productId = resolveProductId(item);
           
           let priceAtOrder = item.priceAtOrder || item.price_at_order;
           if (!priceAtOrder) {
-            const latestPrice = await tx.productPrice.findFirst({
-              where: { product_id: productId },
-              orderBy: { valid_from: 'desc' },
-              select: { retail_price: true }
-            });
-            priceAtOrder = Number(latestPrice?.retail_price || 0);
+            priceAtOrder = latestPrices.get(productId) || 0;
           }
 
           calculatedTotal += priceAtOrder * item.quantity;
 
-          await tx.orderItem.create({
-            data: {
-              order_id: orderId,
-              product_id: productId,
-              quantity: item.quantity,
-              price_at_order: priceAtOrder,
-            },
+          itemRows.push({
+            order_id: orderId,
+            product_id: productId,
+            quantity: item.quantity,
+            price_at_order: priceAtOrder,
           });
 
           const stockRecord = await tx.productStock.findFirst({
@@ -492,19 +531,23 @@ export async function updateOrder(orgId: string, id: string, updatedOrder: any)
               product_id: productId,
               warehouse_id: warehouse.warehouse_id
             },
-            select: { stock_id: true, quantity: true }
+            select: { stock_id: true }
           });
 
-          if (!stockRecord || stockRecord.quantity < item.quantity) {
+          const { count } = stockRecord
+            ? await tx.productStock.updateMany({
+                where: { stock_id: stockRecord.stock_id, quantity: { gte: item.quantity } },
+                data: { quantity: { decrement: item.quantity } }
+              })
+            : { count: 0 };
+
+          if (count === 0) {
             throw new Error(`Insufficient stock for product ${productId}`);
           }
-
-          await tx.productStock.update({
-            where: { stock_id: stockRecord.stock_id },
-            data: { quantity: stockRecord.quantity - item.quantity }
-          });
         }
 
+        await tx.orderItem.createMany({ data: itemRows });
+
         // Update total
         await tx.order.update({
           where: { order_id: orderId },
@@ -527,6 +570,9 @@ export async function updateOrder(orgId: string, id: string, updatedOrder: any)
       timeout: 10000,
     });
 
+    await CacheService.invalidateOrders(orgId);
+    if (defaultWarehouseCreated) revalidateTag('warehouse-list');
+
     // ✅ Notify the order creator about the update
     if (existingOrder.placed_by) {
       const orderCreator = await prisma.user.findUnique({
@@ -548,10 +594,10 @@ export async function updateOrder(orgId: string, id: string, updatedOrder: any)
 
     // ✅ Notify admins if status changed significantly
     const statusChanged = oldStatus !== result.status;
-    const importantStatuses = ['completed', 'cancelled', 'shipped'];
     
-    if (statusChanged && importantStatuses.includes(result.status?.toLowerCase() || '')) {
+    if (statusChanged && IMPORTANT_STATUSES.has(result.status?.toLowerCase() || '')) {
       const orgAdmins = await prisma.organizationMember.findMany({
+        relationLoadStrategy: 'query',
         where: {
           org_id: bigOrgId,
           role: 'admin',
@@ -562,16 +608,14 @@ export async function updateOrder(orgId: string, id: string, updatedOrder: any)
         }
       });
 
-      for (const admin of orgAdmins) {
-        await sendNotification({
-          userId: admin.user.clerk_id,
-          title: 'Order Status Changed',
-          message: `Order #${result.orderId} in "${org?.name}" is now ${result.status}`,
-          type: 'order',
-          priority: result.status === 'completed' ? 'LOW' : 'MEDIUM',
-          link: `/orders/${result.orderId}`,
-        });
-      }
+      await sendNotifications(orgAdmins.map((admin) => ({
+        userId: admin.user.clerk_id,
+        title: 'Order Status Changed',
+        message: `Order #${result.orderId} in "${org?.name}" is now ${result.status}`,
+        type: 'order',
+        priority: result.status === 'completed' ? 'LOW' : 'MEDIUM',
+        link: `/orders/${result.orderId}`,
+      })));
     }
 
     revalidatePath('/orders');
@@ -620,32 +664,32 @@ export async function deleteOrder(orgId: string, id: string) {
   try {
     const bigOrgId = BigInt(orgId);
     
-    await ensureOrganizationMember(orgId);
-    
-    const role = await getUserRole(orgId);
+    const role = await ensureOrganizationMember(orgId);
     if (!hasPermission(role, ['writer', 'read-write', 'admin'])) {
       throw new Error('Insufficient permissions to delete orders');
     }
 
     const orderId = BigInt(id);
-    const user = await getOrCreateUser(userId);
-
-    // Get organization name for notifications
-    const org = await prisma.organization.findUnique({
-      where: { org_id: bigOrgId },
-      select: { name: true }
-    });
 
-    // Check if order exists - FIXED: Use only include, not both include and select
-    const existingOrder = await prisma.order.findFirst({
-      where: {
-        order_id: orderId,
-        org_id: bigOrgId,
-      },
-      include: { 
-        orderItems: true 
-      }
-    });
+    // User, organization name (for notifications) and the existing order are independent lookups
+    const [user, org, existingOrder] = await Promise.all([
+      getOrCreateUser(userId),
+      prisma.organization.findUnique({
+        where: { org_id: bigOrgId },
+        select: { name: true }
+      }),
+      // Check if order exists - FIXED: Use only include, not both include and select
+      prisma.order.findFirst({
+        relationLoadStrategy: 'query',
+        where: {
+          order_id: orderId,
+          org_id: bigOrgId,
+        },
+        include: { 
+          orderItems: true 
+        }
+      }),
+    ]);
 
     if (!existingOrder) {
       throw new Error('Order not found in this organization');
@@ -658,8 +702,11 @@ export async function deleteOrder(orgId: string, id: string) {
 
     const customerName = existingOrder.customer_name;
 
+    let defaultWarehouseCreated = false;
+
     await prisma.$transaction(async (tx:any) => {
-      const warehouse = await getOrCreateDefaultWarehouse(bigOrgId);
+      const warehouse = await getOrCreateDefaultWarehouse(bigOrgId, tx);
+      defaultWarehouseCreated = warehouse.created;
 
       // Add back stock
       for (const item of existingOrder.orderItems) {
@@ -668,13 +715,13 @@ export async function deleteOrder(orgId: string, id: string) {
             product_id: item.product_id,
             warehouse_id: warehouse.warehouse_id
           },
-          select: { stock_id: true, quantity: true }
+          select: { stock_id: true }
         });
 
         if (stockRecord) {
           await tx.productStock.update({
             where: { stock_id: stockRecord.stock_id },
-            data: { quantity: stockRecord.quantity + (item.quantity || 0) }
+            data: { quantity: { increment: item.quantity || 0 } }
           });
         }
       }
@@ -690,6 +737,9 @@ export async function deleteOrder(orgId: string, id: string) {
       });
     });
 
+    await CacheService.invalidateOrders(orgId);
+    if (defaultWarehouseCreated) revalidateTag('warehouse-list');
+
     console.log(`deleteOrder: Successfully deleted order ${id} for customer ${customerName}`);
 
     // ✅ Notify the order creator
@@ -745,20 +795,19 @@ export async function bulkUpdateOrders(orgId: string, updates: { id: string; dat
   try {
     const bigOrgId = BigInt(orgId);
     
-    await ensureOrganizationMember(orgId);
-    
-    const role = await getUserRole(orgId);
+    const role = await ensureOrganizationMember(orgId);
     if (!hasPermission(role, ['writer', 'read-write', 'admin'])) {
       throw new Error('Insufficient permissions to update orders');
     }
 
-    const user = await getOrCreateUser(userId);
-
-    // Get organization name for notifications
-    const org = await prisma.organization.findUnique({
-      where: { org_id: bigOrgId },
-      select: { name: true }
-    });
+    // Get or create user record, and organization name for notifications
+    const [user, org] = await Promise.all([
+      getOrCreateUser(userId),
+      prisma.organization.findUnique({
+        where: { org_id: bigOrgId },
+        select: { name: true }
+      }),
+    ]);
 
     const results = await prisma.$transaction(async (tx:any) => {
       const updateResults = [];
@@ -800,6 +849,8 @@ export async function bulkUpdateOrders(orgId: string, updates: { id: string; dat
       timeout: 30000,
     });
 
+    await CacheService.invalidateOrders(orgId);
+
     // ✅ Notify user about bulk update completion
     await sendNotification({
       userId: user.clerk_id,
@@ -111,7 +111,7 @@ export function AddOrderDialog({
         setLoading(true);
         setError(null);
         
-        const res = await fetch(`/api/inventory/products?orgId=${orgId}`);
+        const res = await fetch(`/api/inventory/products?orgId=${orgId}&view=summary`);
         
         if (!res.ok) {
           if (res.status === 403) {
@@ -7,7 +7,8 @@ import { revalidatePath, revalidateTag, unstable_cache } from 'next/cache';
 import { getAuthContext } from '@/lib/auth-context';
 import { notifyAsync } from '@/lib/notify';
 import { getOrgAccess } from '@/lib/org-access';
-import { sendNotification } from '@/lib/kafka-producer';
+import { sendNotification, sendNotifications } from '@/lib/kafka-producer';
+import { CacheService } from '@/lib/cache';
 import crypto from 'crypto';
 import {
   getUserRole,
@@ -77,6 +78,7 @@ export async function getCachedUserOrganizations(
   const cachedFn = unstable_cache(
     async () => {
       const user = await prisma.user.findUnique({
+        relationLoadStrategy: 'query',
         where: { clerk_id: clerkId },
         select: {
           createdOrganizations: {
@@ -187,6 +189,7 @@ export async function updateOrganization(orgId: string, name: string) {
   });
 
   const members = await prisma.organizationMember.findMany({
+    relationLoadStrategy: 'query',
     where: { org_id: orgIdBig },
     select: { user: { select: { clerk_id: true } } },
   });
@@ -216,9 +219,7 @@ export async function deleteOrganization(orgId: string, force: boolean = false)
   try {
     const bigOrgId = BigInt(orgId);
     
-    await ensureOrganizationMember(orgId);
-    
-    const role = await getUserRole(orgId);
+    const role = await ensureOrganizationMember(orgId);
     if (!(await hasPermission(role, ['admin']))) {
       throw new Error('Only admins can delete organizations');
     }
@@ -232,6 +233,7 @@ export async function deleteOrganization(orgId: string, force: boolean = false)
     if (!orgDetails) throw new Error('Organization not found');
 
     const allMembers = await prisma.organizationMember.findMany({
+      relationLoadStrategy: 'query',
       where: { org_id: bigOrgId },
       select: {
         user: { select: { clerk_id: true, email: true } }
@@ -301,19 +303,18 @@ export async function deleteOrganization(orgId: string, force: boolean = false)
     });
 
     // ✅ Notify all members about the deletion
-    for (const member of allMembers) {
-      await sendNotification({
-        userId: member.user.clerk_id,
-        title: 'Organization Deleted',
-        message: `"${orgDetails.name}" has been permanently deleted${force ? ' along with all its data' : ''}`,
-        type: 'system',
-        priority: 'HIGH',
-        link: '/organization',
-      });
-    }
+    await sendNotifications(allMembers.map((member) => ({
+      userId: member.user.clerk_id,
+      title: 'Organization Deleted',
+      message: `"${orgDetails.name}" has been permanently deleted${force ? ' along with all its data' : ''}`,
+      type: 'system',
+      priority: 'HIGH',
+      link: '/organization',
+    })));
 
     // ✅ Invalidate all organization caches
     await invalidateOrganizationCaches();
+    await CacheService.invalidateOrders(orgId);
     revalidatePath('/organization');
     revalidatePath('/dashboard');
     revalidatePath('/inventory');
@@ -363,9 +364,7 @@ export async function inviteEmployee(orgId: string, email: string, role: string)
     const bigOrgId = BigInt(orgId);
     const trimmedEmail = email.trim().toLowerCase();
 
-    await ensureOrganizationMember(orgId);
-
-    const currentUserRole = await getUserRole(orgId);
+    const currentUserRole = await ensureOrganizationMember(orgId);
     if (!(await hasPermission(currentUserRole, ['admin', 'manager']))) {
       throw new Error('Only admins and managers can invite members');
     }
@@ -380,6 +379,7 @@ export async function inviteEmployee(orgId: string, email: string, role: string)
 
     // ✅ Check if user with this email exists and is already a member
     const existingUser = await prisma.user.findUnique({
+      relationLoadStrategy: 'query',
       where: { email: trimmedEmail },
       select: {
         clerk_id: true,
@@ -495,6 +495,7 @@ export async function acceptInvite(token: string) {
 
   try {
     const invite = await prisma.organizationInvite.findUnique({
+      relationLoadStrategy: 'query',
       where: { token: token.trim() },
       select: {
         org_id: true,
@@ -565,22 +566,23 @@ export async function acceptInvite(token: string) {
 
     // ✅ Notify all admins
     const admins = await prisma.organizationMember.findMany({
+      relationLoadStrategy: 'query',
       where: { org_id: invite.org_id, role: 'admin' },
       include: { user: { select: { clerk_id: true, email: true } } },
     });
 
-    for (const admin of admins) {
-      if (admin.user.clerk_id !== userId) {
-        await sendNotification({
+    await sendNotifications(
+      admins
+        .filter((admin) => admin.user.clerk_id !== userId)
+        .map((admin) => ({
           userId: admin.user.clerk_id,
           title: 'New member joined',
           message: `${user.email} is now a ${invite.role} in ${invite.org.name}`,
           type: 'system',
           priority: 'MEDIUM',
           link: `/organization/${orgId}?tab=members`,
-        });
-      }
-    }
+        }))
+    );
 
     // ✅ Invalidate caches - user now has access to new org
     await invalidateOrganizationCaches();
@@ -607,14 +609,13 @@ export async function removeMember(orgId: string, memberUserId: string) {
   const { userId: currentUserId } = auth();
   if (!currentUserId) throw new Error('Unauthorized');
 
-  await ensureOrganizationMember(orgId);
-  
-  const role = await getUserRole(orgId);
+  const role = await ensureOrganizationMember(orgId);
   if (!(await hasPermission(role, ['admin']))) {
     throw new Error('Only admins can remove members');
   }
 
   const member = await prisma.organizationMember.findUnique({
+    relationLoadStrategy: 'query',
     where: {
       org_id_user_id: {
         org_id: BigInt(orgId),
@@ -650,22 +651,23 @@ export async function removeMember(orgId: string, memberUserId: string) {
 
   // ✅ Notify remaining admins
   const remainingAdmins = await prisma.organizationMember.findMany({
+    relationLoadStrategy: 'query',
     where: { org_id: BigInt(orgId), role: 'admin' },
     include: { user: { select: { clerk_id: true } } },
   });
 
-  for (const admin of remainingAdmins) {
-    if (admin.user.clerk_id !== currentUserId) {
-      await sendNotification({
+  await sendNotifications(
+    remainingAdmins
+      .filter((admin) => admin.user.clerk_id !== currentUserId)
+      .map((admin) => ({
         userId: admin.user.clerk_id,
         title: 'Member removed',
         message: `${member.user.email} was removed from the organization`,
         type: 'system',
         priority: 'MEDIUM',
         link: `/organization/${orgId}/members`,
-      });
-    }
-  }
+      }))
+  );
 
   // ✅ Invalidate caches - membership changed
   await invalidateOrganizationCaches();
@@ -693,9 +695,7 @@ export async function updateMemberRole(orgId: string, targetUserId: string, newR
     const bigOrgId = BigInt(orgId);
     const bigTargetUserId = BigInt(targetUserId);
 
-    await ensureOrganizationMember(orgId);
-
-    const currentUserRole = await getUserRole(orgId);
+    const currentUserRole = await ensureOrganizationMember(orgId);
     if (!(await hasPermission(currentUserRole, ['admin']))) {
       throw new Error('Only admins can update member roles');
     }
@@ -731,6 +731,7 @@ export async function updateMemberRole(orgId: string, targetUserId: string, newR
 
     // Get target member details
     const targetMember = await prisma.organizationMember.findUnique({
+      relationLoadStrategy: 'query',
       where: {
         org_id_user_id: {
           org_id: bigOrgId,
@@ -860,6 +861,7 @@ export async function getOrganizationMembers(orgId: string) {
   await ensureOrganizationMember(orgId);
 
   const members = await prisma.organizationMember.findMany({
+    relationLoadStrategy: 'query',
     where: { org_id: BigInt(orgId) },
     include: {
       user: {
@@ -885,9 +887,7 @@ export async function getOrganizationInvites(orgId: string) {
   const { userId } = auth();
   if (!userId) throw new Error('Unauthorized');
 
-  await ensureOrganizationMember(orgId);
-  
-  const role = await getUserRole(orgId);
+  const role = await ensureOrganizationMember(orgId);
   if (!(await hasPermission(role, ['admin']))) {
     throw new Error('Only admins can view invitations');
   }
@@ -914,9 +914,7 @@ export async function cancelInvite(orgId: string, inviteId: string) {
   const { userId } = auth();
   if (!userId) throw new Error('Unauthorized');
 
-  await ensureOrganizationMember(orgId);
-  
-  const role = await getUserRole(orgId);
+  const role = await ensureOrganizationMember(orgId);
   if (!(await hasPermission(role, ['admin']))) {
     throw new Error('Only admins can cancel invitations');
   }
@@ -2,9 +2,9 @@
 
 import prisma from '@/lib/prisma';
 import { auth } from '@clerk/nextjs/server';
-import { getUserRole, hasPermission, ensureOrganizationMember } from '@/lib/auth';
+import { hasPermission, ensureOrganizationMember } from '@/lib/auth';
 import { revalidatePath, revalidateTag } from 'next/cache';
-import { sendNotification } from '@/lib/kafka-producer';
+import { sendNotification, sendNotifications } from '@/lib/kafka-producer';
 
 function invalidateWarehouseCaches() {
   revalidateTag('warehouses');
@@ -19,9 +19,7 @@ export async function createWarehouse(orgId: string, data: { name: string; addre
   if (!data.address?.trim()) throw new Error('Warehouse address is required');
 
   try {
-    await ensureOrganizationMember(orgId);
-    
-    const role = await getUserRole(orgId);
+    const role = await ensureOrganizationMember(orgId);
     if (!hasPermission(role, ['writer', 'read-write', 'admin'])) {
       throw new Error('Insufficient permissions to create warehouse');
     }
@@ -66,6 +64,7 @@ export async function createWarehouse(orgId: string, data: { name: string; addre
 
     // ✅ Notify organization admins
     const orgAdmins = await prisma.organizationMember.findMany({
+      relationLoadStrategy: 'query',
       where: {
         org_id: bigOrgId,
         role: 'admin',
@@ -76,16 +75,14 @@ export async function createWarehouse(orgId: string, data: { name: string; addre
       }
     });
 
-    for (const admin of orgAdmins) {
-      await sendNotification({
-        userId: admin.user.clerk_id,
-        title: 'New Warehouse Added',
-        message: `Warehouse "${warehouse.name}" was added to "${org?.name}"`,
-        type: 'system',
-        priority: 'LOW',
-        link: `/warehouse/${warehouse.warehouse_id.toString()}?orgId=${orgId}`,
-      });
-    }
+    await sendNotifications(orgAdmins.map((admin) => ({
+      userId: admin.user.clerk_id,
+      title: 'New Warehouse Added',
+      message: `Warehouse "${warehouse.name}" was added to "${org?.name}"`,
+      type: 'system',
+      priority: 'LOW',
+      link: `/warehouse/${warehouse.warehouse_id.toString()}?orgId=${orgId}`,
+    })));
 
     invalidateWarehouseCaches();
 
@@ -121,9 +118,7 @@ export async function updateWarehouse(
   if (!data.address?.trim()) throw new Error('Warehouse address is required');
 
   try {
-    await ensureOrganizationMember(orgId);
-    
-    const role = await getUserRole(orgId);
+    const role = await ensureOrganizationMember(orgId);
     if (!hasPermission(role, ['writer', 'read-write', 'admin'])) {
       throw new Error('Insufficient permissions to update warehouse');
     }
@@ -131,20 +126,20 @@ export async function updateWarehouse(
     const bigOrgId = BigInt(orgId);
     const bigWarehouseId = BigInt(warehouseId);
 
-    // Get organization info for notifications
-    const org = await prisma.organization.findUnique({
-      where: { org_id: bigOrgId },
-      select: { name: true }
-    });
-
-    // Verify warehouse belongs to organization
-    const existingWarehouse = await prisma.warehouse.findFirst({
-      where: {
-        warehouse_id: bigWarehouseId,
-        org_id: bigOrgId,
-      },
-      select: { warehouse_id: true, name: true }
-    });
+    // Get organization info for notifications and verify warehouse belongs to organization
+    const [org, existingWarehouse] = await Promise.all([
+      prisma.organization.findUnique({
+        where: { org_id: bigOrgId },
+        select: { name: true }
+      }),
+      prisma.warehouse.findFirst({
+        where: {
+          warehouse_id: bigWarehouseId,
+          org_id: bigOrgId,
+        },
+        select: { warehouse_id: true, name: true }
+      })
+    ]);
 
     if (!existingWarehouse) {
       throw new Error('Warehouse not found in this organization');
@@ -178,6 +173,7 @@ export async function updateWarehouse(
 
     // ✅ Notify organization managers and admins
     const orgMembers = await prisma.organizationMember.findMany({
+      relationLoadStrategy: 'query',
       where: {
         org_id: bigOrgId,
         role: { in: ['admin', 'manager'] },
@@ -188,16 +184,14 @@ export async function updateWarehouse(
       }
     });
 
-    for (const member of orgMembers) {
-      await sendNotification({
-        userId: member.user.clerk_id,
-        title: 'Warehouse Updated',
-        message: `Warehouse "${oldName}" in "${org?.name}" was updated to "${warehouse.name}"`,
-        type: 'system',
-        priority: 'LOW',
-        link: `/warehouse/${warehouse.warehouse_id.toString()}?orgId=${orgId}`,
-      });
-    }
+    await sendNotifications(orgMembers.map((member) => ({
+      userId: member.user.clerk_id,
+      title: 'Warehouse Updated',
+      message: `Warehouse "${oldName}" in "${org?.name}" was updated to "${warehouse.name}"`,
+      type: 'system',
+      priority: 'LOW',
+      link: `/warehouse/${warehouse.warehouse_id.toString()}?orgId=${orgId}`,
+    })));
 
     invalidateWarehouseCaches();
     revalidatePath('/warehouse');
@@ -226,9 +220,7 @@ export async function deleteWarehouse(orgId: string, warehouseId: string) {
   if (!userId) throw new Error('Unauthorized');
 
   try {
-    await ensureOrganizationMember(orgId);
-    
-    const role = await getUserRole(orgId);
+    const role = await ensureOrganizationMember(orgId);
     if (!hasPermission(role, ['admin'])) {
       throw new Error('Only admins can delete warehouses');
     }
@@ -236,18 +228,27 @@ export async function deleteWarehouse(orgId: string, warehouseId: string) {
     const bigOrgId = BigInt(orgId);
     const bigWarehouseId = BigInt(warehouseId);
 
-    // Get organization info for notifications
-    const org = await prisma.organization.findUnique({
-      where: { org_id: bigOrgId },
-      select: { name: true }
-    });
+    // Get organization info for notifications, the org's warehouses (to check for the
+    // default/first one) and the stock count; the checks below still run in order
+    const [org, warehouses, stockCount] = await Promise.all([
+      prisma.organization.findUnique({
+        where: { org_id: bigOrgId },
+        select: { name: true }
+      }),
+      prisma.warehouse.findMany({
+        where: { org_id: bigOrgId },
+        orderBy: { created_at: 'asc' },
+        select: { warehouse_id: true, name: true }
+      }),
+      prisma.productStock.count({
+        where: { warehouse_id: bigWarehouseId }
+      })
+    ]);
 
-    // Check if it's the default/first warehouse
-    const warehouses = await prisma.warehouse.findMany({
-      where: { org_id: bigOrgId },
-      orderBy: { created_at: 'asc' },
-      select: { warehouse_id: true, name: true }
-    });
+    const target = warehouses.find(w => w.warehouse_id === bigWarehouseId);
+    if (!target) {
+      throw new Error('Warehouse not found in this organization');
+    }
 
     if (warehouses.length === 1) {
       throw new Error('Cannot delete the last warehouse. Organizations must have at least one warehouse.');
@@ -258,15 +259,11 @@ export async function deleteWarehouse(orgId: string, warehouseId: string) {
     }
 
     // Check for existing stock
-    const stockCount = await prisma.productStock.count({
-      where: { warehouse_id: bigWarehouseId }
-    });
-
     if (stockCount > 0) {
       throw new Error('Cannot delete warehouse with existing stock. Please move or remove all stock first.');
     }
 
-    const warehouseName = warehouses.find(w => w.warehouse_id === bigWarehouseId)?.name;
+    const warehouseName = target.name;
 
     await prisma.warehouse.delete({
       where: { warehouse_id: bigWarehouseId }
@@ -284,6 +281,7 @@ export async function deleteWarehouse(orgId: string, warehouseId: string) {
 
     // ✅ Notify organization admins
     const orgAdmins = await prisma.organizationMember.findMany({
+      relationLoadStrategy: 'query',
       where: {
         org_id: bigOrgId,
         role: 'admin',
@@ -294,16 +292,14 @@ export async function deleteWarehouse(orgId: string, warehouseId: string) {
       }
     });
 
-    for (const admin of orgAdmins) {
-      await sendNotification({
-        userId: admin.user.clerk_id,
-        title: 'Warehouse Deleted',
-        message: `Warehouse "${warehouseName}" was deleted from "${org?.name}"`,
-        type: 'system',
-        priority: 'MEDIUM',
-        link: `/warehouse`,
-      });
-    }
+    await sendNotifications(orgAdmins.map((admin) => ({
+      userId: admin.user.clerk_id,
+      title: 'Warehouse Deleted',
+      message: `Warehouse "${warehouseName}" was deleted from "${org?.name}"`,
+      type: 'system',
+      priority: 'MEDIUM',
+      link: `/warehouse`,
+    })));
 
     invalidateWarehouseCaches();
 
@@ -10,6 +10,7 @@ import {
   TableRow,
 } from "@/components/ui/table";
 import { Package } from "lucide-react";
+import { LOW_STOCK_THRESHOLD } from "@/lib/constants/inventory";
 
 type ProductStock = {
   productId: string;
@@ -64,7 +65,7 @@ export function WarehouseProductsTable({ products }: Props) {
                 <TableCell className="font-medium">{product.productName}</TableCell>
                 <TableCell>{product.sku}</TableCell>
                 <TableCell className="text-right">
-                  <span className={`font-semibold ${product.quantity < 10 ? 'text-destructive' : ''}`}>
+                  <span className={`font-semibold ${product.quantity < LOW_STOCK_THRESHOLD ? 'text-destructive' : ''}`}>
                     {product.quantity.toLocaleString()}
                   </span>
                 </TableCell>
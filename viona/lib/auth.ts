@@ -36,6 +36,7 @@ const getCachedOrgMembership = unstable_cache(
     const bigUserId = BigInt(userId);
     
     const org = await prisma.organization.findUnique({
+      relationLoadStrategy: 'query',
       where: { org_id: bigOrgId },
       select: {
         org_id: true,
@@ -148,7 +149,11 @@ export async function hasPermission(role: string | null, requiredRoles: string[]
   return requiredRoles.includes(role);
 }
 
-export async function ensureOrganizationMember(orgId: string): Promise<void> {
+/**
+ * Throws unless the current user belongs to the organization.
+ * Resolves to the member's role so callers don't repeat the lookup.
+ */
+export async function ensureOrganizationMember(orgId: string): Promise<string> {
   const { userId } = auth();
   if (!userId) throw new Error('Authentication required');
 
@@ -182,6 +187,7 @@ export async function ensureOrganizationMember(orgId: string): Promise<void> {
       });
     }
 
+    return membership.role;
   } catch (error) {
     throw error;
   }
@@ -194,9 +200,7 @@ export async function getUserWithPermissions(
   const { userId } = auth();
   if (!userId) throw new Error('Authentication required');
 
-  await ensureOrganizationMember(orgId);
-  
-  const role = await getUserRole(orgId);
+  const role = await ensureOrganizationMember(orgId);
   if (!role || !(await hasPermission(role, requiredRoles))) {
     throw new Error(`Insufficient permissions. Required: ${requiredRoles.join(', ')}`);
   }
@@ -219,6 +223,7 @@ export async function invalidateOrgMemberCache() {
 export async function debugUserOrgs(userId: string) {
   try {
     const user = await prisma.user.findUnique({
+      relationLoadStrategy: 'query',
       where: { clerk_id: userId },
       include: {
         createdOrganizations: {
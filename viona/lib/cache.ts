@@ -1,6 +1,7 @@
 // File: lib/cache.ts
 import { redis, CACHE_CONFIG, getCacheKey, getLastModifiedKey } from './redis';
 import { Product } from '@/app/api/inventory/products/route';
+import { Order } from '@/app/api/orders/route';
 
 export class CacheService {
   // Generic cache methods
@@ -72,6 +73,42 @@ export class CacheService {
     await this.setLastModified("products", orgId);
   }
 
+  // Order cache (short TTL, keyed by a per-org generation)
+  // Readers take the generation before querying the DB, and order writes bump
+  // it after commit, so a list read before a write can only land under a
+  // generation nobody reads again.
+  static async getOrdersGeneration(orgId: string): Promise<number | null> {
+    const key = getCacheKey(CACHE_CONFIG.KEYS.ORDERS_GEN, orgId);
+
+    try {
+      const gen = await redis.get(key);
+      return gen ? Number(gen) : 0;
+    } catch (error) {
+      console.error("Get orders generation error:", error);
+      return null;
+    }
+  }
+
+  static async getOrders(orgId: string, gen: number): Promise<Order[] | null> {
+    const key = getCacheKey(CACHE_CONFIG.KEYS.ORDERS, orgId, gen);
+    return this.get<Order[]>(key);
+  }
+
+  static async setOrders(orgId: string, gen: number, orders: Order[]): Promise<void> {
+    const key = getCacheKey(CACHE_CONFIG.KEYS.ORDERS, orgId, gen);
+    await this.set(key, orders, CACHE_CONFIG.TTL.ORDERS);
+  }
+
+  static async invalidateOrders(orgId: string): Promise<void> {
+    const key = getCacheKey(CACHE_CONFIG.KEYS.ORDERS_GEN, orgId);
+
+    try {
+      await redis.multi().incr(key).expire(key, CACHE_CONFIG.TTL.ORDERS_GEN).exec();
+    } catch (error) {
+      console.error("Invalidate orders error:", error);
+    }
+  }
+
   // User organizations cache
   static async getUserOrganizations(userId: string): Promise<any[] | null> {
     const key = getCacheKey(CACHE_CONFIG.KEYS.USER_ORGS, userId);
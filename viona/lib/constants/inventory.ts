@@ -0,0 +1,3 @@
+// lib/constants/inventory.ts
+// Products with stock above zero but below this many units are "low stock"
+export const LOW_STOCK_THRESHOLD = 10;
@@ -6,7 +6,8 @@ if (typeof window !== "undefined") {
 
 let producer: Producer | null = null;
 let isConnected = false;
-let isConnecting = false;
+// In-flight connection attempt, shared by every caller that arrives while it runs
+let connecting: Promise<Producer | null> | null = null;
 
 const BROKER = process.env.KAFKA_BROKER || "localhost:29092";
 
@@ -42,12 +43,7 @@ const createProducer = () => {
 };
 
 
-const tryGetKafkaProducer = async (): Promise<Producer | null> => {
-  if (isConnected && producer) return producer;
-  if (isConnecting) return null;
-
-  isConnecting = true;
-
+const connectProducer = async (): Promise<Producer | null> => {
   try {
     producer?.disconnect().catch(() => {});
     producer = createProducer();
@@ -59,11 +55,21 @@ const tryGetKafkaProducer = async (): Promise<Producer | null> => {
     producer = null;
     isConnected = false;
     return null;
-  } finally {
-    isConnecting = false;
   }
 };
 
+const tryGetKafkaProducer = async (): Promise<Producer | null> => {
+  if (isConnected && producer) return producer;
+
+  if (!connecting) {
+    connecting = connectProducer().finally(() => {
+      connecting = null;
+    });
+  }
+
+  return connecting;
+};
+
 export const sendNotification = async (payload: any) => {
   try {
     const p = await tryGetKafkaProducer();
@@ -82,3 +88,25 @@ export const sendNotification = async (payload: any) => {
     console.error("Failed to send notification:", err);
   }
 };
+
+// Fan-out variant: all payloads go to the broker in a single produce request
+export const sendNotifications = async (payloads: any[]) => {
+  if (payloads.length === 0) return;
+
+  try {
+    const p = await tryGetKafkaProducer();
+    if (!p) {
+      console.warn(`Kafka unavailable, ${payloads.length} notifications dropped`);
+      return;
+    }
+
+    await p.send({
+      topic: "send_notification",
+      messages: payloads.map((payload) => ({ value: JSON.stringify(payload) })),
+    });
+
+    console.log(`Notifications sent: ${payloads.length}`);
+  } catch (err) {
+    console.error("Failed to send notifications:", err);
+  }
+};
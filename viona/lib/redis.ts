@@ -38,10 +38,14 @@ export const CACHE_CONFIG = {
     PRODUCTS: 60 * 15,
     ORGANIZATIONS: 60 * 30,
     USER_DATA: 60 * 10,
+    ORDERS: 60,
+    ORDERS_GEN: 60 * 60 * 24,
   },
 
   KEYS: {
     PRODUCTS: "products",
+    ORDERS: "orders",
+    ORDERS_GEN: "orders-gen",
     ORGANIZATIONS: "organizations",
     USER_ORGS: "user-organizations",
     ORG_MEMBERS: "org-members",